@@ -1,10 +1,10 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash
+from flask import Flask, render_template, request, redirect, url_for, session, flash, abort
 from dotenv import load_dotenv
 import os
-from analysis import StockAnalyzer
 import secrets
 import concurrent.futures
 import uuid
+from collections import OrderedDict
 
 # Load environment variables
 load_dotenv()
@@ -14,8 +14,50 @@ app.secret_key = os.getenv("FLASK_SECRET_KEY", secrets.token_hex(16))
 APP_PASSWORD = os.getenv("APP_PASSWORD")
 REQUIRE_LOGIN = os.getenv("REQUIRE_LOGIN", "true").lower() == "true"
 
+# analysis/basket pull in yfinance, pandas, ta and numpy. They are imported
+# inside the routes that need them so /health and / stay lightweight; the
+# startup warm-up imports them ahead of time when enabled.
+
 # In-memory cache for analysis results to avoid cookie size limits
 RESULTS_CACHE = {}
+# Close series per batch (analysis_id -> {ticker: Series}), benchmark series
+# fetched for a batch and the basket analyzers built from them (both keyed by
+# (analysis_id, benchmark)). A batch holds ~2y of closes per ticker plus an
+# N x N matrix per benchmark, so only the most recently used batches are kept.
+CLOSES_CACHE = OrderedDict()
+BENCHMARK_CACHE = {}
+BASKET_CACHE = {}
+BASKET_CACHE_SIZE = int(os.getenv("BASKET_CACHE_SIZE", "5"))
+# Benchmarks offered by the basket view
+BASKET_BENCHMARKS = ("SPY", "QQQ")
+
+# Static ticker universe. Kept at module level (and immutable) so it is built
+# once and, with a preloaded gunicorn master, shared by every worker.
+POPULAR_STOCKS = (
+    "TSLA", "NVDA", "AMD", "AAPL", "AMZN", "MSFT", "META", "GOOGL", "NFLX", "COIN",
+    "MARA", "RIOT", "PLTR", "SOFI", "LCID", "RIVN", "NIO", "BABA", "PDD", "JD",
+    "TQQQ", "SQQQ", "SPY", "QQQ", "IWM", "UVXY", "LABU", "SOXL", "SOXS", "F",
+    "BAC", "DIS", "PYPL", "SQ", "ROKU", "DKNG", "UBER", "LYFT", "HOOD", "GME",
+    "AMC", "BB", "NOK", "SNDL", "TLRY", "CGC", "CRSP", "MRNA", "PFE", "XOM",
+    "CVX", "OXY", "MRO", "HAL", "SLB", "JPM", "GS", "MS", "C", "WFC",
+    "BA", "AAL", "DAL", "UAL", "LUV", "CCL", "RCL", "NCLH", "MGM", "LVS",
+    "WYNN", "INTC", "MU", "QCOM", "TXN", "AVGO", "ADBE", "CRM", "ORCL", "IBM",
+    "SNOW", "DDOG", "NET", "TEAM", "ZM", "DOCU", "TWLO", "SPOT", "PINS", "SNAP",
+    "BIDU", "TCEHY", "XPEV", "LI", "FUTU", "TIGR", "UPST", "AFRM", "AI", "CVNA"
+)
+
+# Forex pairs (Yahoo Finance format: EURUSD=X)
+FOREX = (
+    "EURUSD=X", "JPY=X", "GBPUSD=X", "AUDUSD=X", "NZDUSD=X", "EURJPY=X", "GBPJPY=X",
+    "EURGBP=X", "EURCAD=X", "EURSEK=X", "EURCHF=X", "CHF=X", "CAD=X", "HKD=X", "SEK=X"
+)
+
+# Crypto (Yahoo Finance format: BTC-USD)
+CRYPTO = (
+    "BTC-USD", "ETH-USD", "USDT-USD", "BNB-USD", "SOL-USD", "XRP-USD", "USDC-USD", "ADA-USD",
+    "AVAX-USD", "DOGE-USD", "TRX-USD", "LINK-USD", "DOT-USD", "MATIC-USD", "LTC-USD", "SHIB-USD",
+    "UNI7083-USD", "OKB-USD", "ATOM-USD", "XLM-USD", "XMR-USD", "ETC-USD", "FIL-USD", "HBAR-USD"
+)
 
 def is_authenticated():
     if not REQUIRE_LOGIN:
@@ -47,32 +89,6 @@ def dashboard():
     if not is_authenticated():
         return redirect(url_for('login'))
     
-    popular_stocks = [
-        "TSLA", "NVDA", "AMD", "AAPL", "AMZN", "MSFT", "META", "GOOGL", "NFLX", "COIN",
-        "MARA", "RIOT", "PLTR", "SOFI", "LCID", "RIVN", "NIO", "BABA", "PDD", "JD",
-        "TQQQ", "SQQQ", "SPY", "QQQ", "IWM", "UVXY", "LABU", "SOXL", "SOXS", "F",
-        "BAC", "DIS", "PYPL", "SQ", "ROKU", "DKNG", "UBER", "LYFT", "HOOD", "GME",
-        "AMC", "BB", "NOK", "SNDL", "TLRY", "CGC", "CRSP", "MRNA", "PFE", "XOM",
-        "CVX", "OXY", "MRO", "HAL", "SLB", "JPM", "GS", "MS", "C", "WFC",
-        "BA", "AAL", "DAL", "UAL", "LUV", "CCL", "RCL", "NCLH", "MGM", "LVS",
-        "WYNN", "INTC", "MU", "QCOM", "TXN", "AVGO", "ADBE", "CRM", "ORCL", "IBM",
-        "SNOW", "DDOG", "NET", "TEAM", "ZM", "DOCU", "TWLO", "SPOT", "PINS", "SNAP",
-        "BIDU", "TCEHY", "XPEV", "LI", "FUTU", "TIGR", "UPST", "AFRM", "AI", "CVNA"
-    ]
-
-    # Forex pairs (Yahoo Finance format: EURUSD=X)
-    forex = [
-        "EURUSD=X", "JPY=X", "GBPUSD=X", "AUDUSD=X", "NZDUSD=X", "EURJPY=X", "GBPJPY=X",
-        "EURGBP=X", "EURCAD=X", "EURSEK=X", "EURCHF=X", "CHF=X", "CAD=X", "HKD=X", "SEK=X"
-    ]
-
-    # Crypto (Yahoo Finance format: BTC-USD)
-    crypto = [
-        "BTC-USD", "ETH-USD", "USDT-USD", "BNB-USD", "SOL-USD", "XRP-USD", "USDC-USD", "ADA-USD",
-        "AVAX-USD", "DOGE-USD", "TRX-USD", "LINK-USD", "DOT-USD", "MATIC-USD", "LTC-USD", "SHIB-USD",
-        "UNI7083-USD", "OKB-USD", "ATOM-USD", "XLM-USD", "XMR-USD", "ETC-USD", "FIL-USD", "HBAR-USD"
-    ]
-
     if request.method == 'POST':
         ticker = request.form.get('ticker')
         timeframe = request.form.get('timeframe', '1d')
@@ -82,24 +98,28 @@ def dashboard():
         
         selected_tickers = request.form.getlist('selected_tickers')
         if selected_tickers:
+            from analysis import StockAnalyzer
+
             results = []
+            closes = {}
             
             def analyze_one(t, tf):
                 try:
                     a = StockAnalyzer(t, interval=tf)
                     if a.fetch_data():
-                        return a.analyze()
+                        return a.analyze(), a.data['Close']
                 except:
                     pass
-                return None
+                return None, None
 
             with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
                 future_to_ticker = {executor.submit(analyze_one, t, timeframe): t for t in selected_tickers}
                 for future in concurrent.futures.as_completed(future_to_ticker):
                     try:
-                        res = future.result()
+                        res, close = future.result()
                         if res and "error" not in res:
                             results.append(res)
+                            closes[res['ticker']] = close
                     except:
                         pass
             
@@ -116,10 +136,11 @@ def dashboard():
             # Save to CACHE
             analysis_id = str(uuid.uuid4())
             RESULTS_CACHE[analysis_id] = results
+            remember_batch(analysis_id, closes)
             
             return redirect(url_for('multi_result', analysis_id=analysis_id, page=0))
             
-    return render_template('index.html', stocks=popular_stocks, forex=forex, crypto=crypto)
+    return render_template('index.html', stocks=POPULAR_STOCKS, forex=FOREX, crypto=CRYPTO)
 
 @app.route('/multi_result/<analysis_id>/<int:page>')
 def multi_result(analysis_id, page):
@@ -145,11 +166,114 @@ def multi_result(analysis_id, page):
         analysis_id=analysis_id
     )
 
+def remember_batch(analysis_id, closes=None):
+    # LRU over analysis_id shared by the three basket caches
+    if closes is not None:
+        CLOSES_CACHE[analysis_id] = closes
+    CLOSES_CACHE.move_to_end(analysis_id)
+    while len(CLOSES_CACHE) > BASKET_CACHE_SIZE:
+        evicted, _ = CLOSES_CACHE.popitem(last=False)
+        for cache in (BENCHMARK_CACHE, BASKET_CACHE):
+            for key in [k for k in cache if k[0] == evicted]:
+                del cache[key]
+
+def get_basket(analysis_id, benchmark):
+    closes = CLOSES_CACHE.get(analysis_id)
+    if not closes:
+        return None
+    remember_batch(analysis_id)
+
+    key = (analysis_id, benchmark)
+    if key not in BASKET_CACHE:
+        from analysis import StockAnalyzer
+        from basket import BasketAnalyzer
+
+        interval = RESULTS_CACHE[analysis_id][0].get('interval', '1d')
+        # The benchmark may not be part of the selection; fetch it once and
+        # keep it apart so it does not leak into baskets of other benchmarks
+        if benchmark not in closes and key not in BENCHMARK_CACHE:
+            analyzer = StockAnalyzer(benchmark, interval=interval)
+            if not analyzer.fetch_data():
+                return None
+            BENCHMARK_CACHE[key] = analyzer.data['Close']
+        if benchmark not in closes:
+            closes = dict(closes, **{benchmark: BENCHMARK_CACHE[key]})
+        BASKET_CACHE[key] = BasketAnalyzer(closes, benchmark=benchmark, interval=interval)
+    return BASKET_CACHE[key]
+
+def refresh_basket(analysis_id, benchmark):
+    from basket import BasketAnalyzer, fetch_closes
+
+    key = (analysis_id, benchmark)
+    basket = BASKET_CACHE[key]
+    # Every bar since the last known one, in a single download. Tickers
+    # missing from it are dropped by refresh(); a failed download is retried
+    # on the next poll.
+    recent = fetch_closes(basket.tickers, basket.interval, period="5d")
+    if not recent or basket.refresh(recent):
+        return basket
+
+    # Missed more than the recent download covers: rebuild from full history
+    tickers = set(CLOSES_CACHE[analysis_id]) | {benchmark}
+    closes = fetch_closes(tickers, basket.interval, period="2y")
+    if benchmark in closes:
+        BASKET_CACHE[key] = BasketAnalyzer(closes, benchmark=benchmark, interval=basket.interval)
+    return BASKET_CACHE[key]
+
+@app.route('/basket/<analysis_id>')
+def basket_result(analysis_id):
+    if not is_authenticated():
+        return redirect(url_for('login'))
+
+    if analysis_id not in CLOSES_CACHE:
+        flash("La sesión de análisis ha expirado o no existe.", "error")
+        return redirect(url_for('dashboard'))
+
+    benchmark = request.args.get('benchmark', 'SPY').upper()
+    if benchmark not in BASKET_BENCHMARKS:
+        abort(400)
+
+    basket = get_basket(analysis_id, benchmark)
+    if basket is None:
+        flash(f"No se pudieron obtener datos para {benchmark}.", "error")
+        return redirect(url_for('multi_result', analysis_id=analysis_id, page=0))
+
+    res = basket.analyze()
+    if "error" in res:
+        flash(res['error'], "error")
+        return redirect(url_for('multi_result', analysis_id=analysis_id, page=0))
+
+    return render_template('basket.html', data=res, analysis_id=analysis_id, benchmarks=BASKET_BENCHMARKS)
+
+@app.route('/basket/<analysis_id>/json')
+def basket_json(analysis_id):
+    if not is_authenticated():
+        return {"error": "Unauthorized"}, 401
+
+    benchmark = request.args.get('benchmark', 'SPY').upper()
+    if benchmark not in BASKET_BENCHMARKS:
+        return {"error": f"Índice de referencia no válido. Opciones: {', '.join(BASKET_BENCHMARKS)}"}, 400
+
+    basket = get_basket(analysis_id, benchmark)
+    if basket is None:
+        return {"error": "Error obteniendo datos."}, 404
+
+    # Apply the new bars incrementally instead of rebuilding the basket
+    if request.args.get('refresh') == '1' and basket.is_ready():
+        basket = refresh_basket(analysis_id, benchmark)
+
+    res = basket.analyze()
+    if "error" in res:
+        return {"error": res['error']}, 400
+    return res
+
 @app.route('/result/<ticker>')
 def result(ticker):
     if not is_authenticated():
         return redirect(url_for('login'))
         
+    from analysis import StockAnalyzer
+
     timeframe = request.args.get('timeframe', '1d')
     analyzer = StockAnalyzer(ticker, interval=timeframe)
     if analyzer.fetch_data():
@@ -167,6 +291,8 @@ def result_json(ticker):
     if not is_authenticated():
         return {"error": "Unauthorized"}, 401
         
+    from analysis import StockAnalyzer
+
     timeframe = request.args.get('timeframe', '1d')
     analyzer = StockAnalyzer(ticker, interval=timeframe)
     if analyzer.fetch_data():
@@ -213,6 +339,8 @@ def api_analyze():
         return {"error": "Bad Request", "message": "Ticker is required"}, 400
 
     # 3. Analysis
+    from analysis import StockAnalyzer
+
     try:
         analyzer = StockAnalyzer(ticker, interval=interval)
         if analyzer.fetch_data():
@@ -0,0 +1,387 @@
+import yfinance as yf
+import pandas as pd
+import numpy as np
+
+# Bars a ticker may be forward-filled on the benchmark's calendar (holidays,
+# missing candles) before it is considered to have a gap
+MAX_FILL = 3
+
+
+def _align_index(series, interval):
+    # yfinance returns each exchange in its own timezone (NY for stocks, UTC for
+    # crypto, London for forex). Daily bars are matched by calendar date,
+    # intraday bars by their UTC hour: US stocks print on :30 and forex/crypto
+    # on :00, so both are floored onto the same hourly grid.
+    s = series.dropna()
+    idx = s.index
+    if interval == "1d":
+        if idx.tz is not None:
+            idx = idx.tz_localize(None)
+        idx = idx.normalize()
+    else:
+        if idx.tz is not None:
+            idx = idx.tz_convert("UTC").tz_localize(None)
+        idx = idx.floor("h")
+    s = s.copy()
+    s.index = idx
+    return s[~s.index.duplicated(keep="last")]
+
+
+def _align_frame(closes, interval):
+    return pd.concat(
+        {t.upper(): _align_index(s, interval) for t, s in closes.items()},
+        axis=1,
+    ).sort_index()
+
+
+def fetch_closes(tickers, interval="1d", period="5d"):
+    """
+    Downloads close series for every ticker in a single request.
+    Returns {ticker: Series}, empty if nothing came back.
+    """
+    tickers = list(tickers)
+    try:
+        data = yf.download(tickers, period=period, interval=interval, auto_adjust=True, progress=False)
+    except Exception as e:
+        print(f"Error fetching closes: {e}")
+        return {}
+    if data is None or data.empty:
+        return {}
+
+    closes = data["Close"]
+    if isinstance(closes, pd.Series):
+        closes = closes.to_frame(name=tickers[0])
+    return {t: closes[t] for t in closes.columns if closes[t].notna().any()}
+
+
+class _RowBuffer:
+    """
+    Keeps the last `capacity` rows of an array in preallocated storage.
+    Appending writes in place; only when the storage is exhausted are the
+    live rows copied back to the front, so the cost per row is amortized
+    O(row size) regardless of how much history has gone through it.
+    """
+
+    def __init__(self, rows, capacity):
+        rows = np.asarray(rows)[-capacity:]
+        self.capacity = capacity
+        self._data = np.empty((2 * capacity,) + rows.shape[1:], dtype=rows.dtype)
+        self._data[:len(rows)] = rows
+        self._start = 0
+        self._len = len(rows)
+
+    def __len__(self):
+        return self._len
+
+    @property
+    def values(self):
+        return self._data[self._start:self._start + self._len]
+
+    def append(self, row):
+        end = self._start + self._len
+        if end == len(self._data):
+            keep = min(self._len, self.capacity - 1)
+            self._data[:keep] = self._data[end - keep:end].copy()
+            self._start, self._len = 0, keep
+            end = keep
+        self._data[end] = row
+        if self._len == self.capacity:
+            self._start += 1
+        else:
+            self._len += 1
+
+    def replace_last(self, row):
+        self._data[self._start + self._len - 1] = row
+
+
+class BasketAnalyzer:
+    """
+    Correlation, beta and relative strength for a basket of tickers.
+
+    Close series are aligned on the benchmark's calendar into a single price
+    matrix (dates x tickers) and every statistic is derived from matrix
+    operations on its log returns. Only the history the window and the
+    rolling chart need is kept, and the window sums (sum of returns and the
+    cross-product matrix) are updated in place, so a new bar costs an O(N^2)
+    rank-one update instead of recomputing the whole window.
+    """
+
+    def __init__(self, closes, benchmark="SPY", interval="1d", window=60, points=100):
+        self.benchmark = benchmark.upper()
+        self.interval = interval
+        self.window = window
+        self.points = points
+        self.tickers = []
+        self.excluded = []
+        self._prices = None
+        self._returns = None
+        self._dates = None
+        self._rolling = None
+        self._sum = None
+        self._cross = None
+        self._updates = 0
+        self._build(closes)
+
+    def _build(self, closes):
+        frame = _align_frame(closes, self.interval)
+        if self.benchmark not in frame.columns:
+            self.excluded = sorted(frame.columns)
+            return
+
+        capacity = self.window + self.points
+        frame = frame[frame[self.benchmark].notna()].ffill(limit=MAX_FILL).iloc[-capacity:]
+
+        # A ticker with a short history or a gap inside the window is dropped
+        # rather than cutting the shared history for the whole basket
+        recent = frame.iloc[-(self.window + 1):]
+        complete = [t for t in frame.columns if recent[t].notna().all()]
+        self.excluded = sorted(t for t in frame.columns if t not in complete)
+        if self.benchmark not in complete:
+            return
+        frame = frame[complete]
+
+        # Older gaps only shorten the rolling chart
+        gaps = np.flatnonzero(frame.isna().any(axis=1).to_numpy())
+        if len(gaps):
+            frame = frame.iloc[gaps[-1] + 1:]
+
+        self.tickers = list(frame.columns)
+        prices = frame.to_numpy(dtype=float)
+        returns = np.diff(np.log(prices), axis=0)
+        self._prices = _RowBuffer(prices, capacity)
+        self._dates = _RowBuffer(frame.index.values, capacity)
+        self._returns = _RowBuffer(returns, capacity - 1)
+        if len(returns) >= self.window:
+            self._recompute_window()
+            self._rolling = _RowBuffer(self._initial_rolling(returns), self.points)
+
+    def _recompute_window(self):
+        tail = self._returns.values[-self.window:]
+        self._sum = tail.sum(axis=0)
+        self._cross = tail.T @ tail
+        self._updates = 0
+
+    def _initial_rolling(self, returns):
+        # Rolling correlation of every ticker against the benchmark at once,
+        # from windowed differences of cumulative sums.
+        w = self.window
+        b = self.tickers.index(self.benchmark)
+        r = returns
+        rb = r[:, b:b + 1]
+
+        def windowed(x):
+            c = np.cumsum(np.vstack([np.zeros((1, x.shape[1])), x]), axis=0)
+            return c[w:] - c[:-w]
+
+        s_x = windowed(r)
+        s_b = windowed(rb)
+        cov = windowed(r * rb) - s_x * s_b / w
+        var_x = windowed(r * r) - s_x * s_x / w
+        var_b = windowed(rb * rb) - s_b * s_b / w
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.sqrt(var_x * var_b)
+        return np.clip(np.nan_to_num(corr), -1.0, 1.0)
+
+    def _benchmark_corr(self):
+        # Current window's correlation against the benchmark, O(N) from the sums
+        w = self.window
+        b = self.tickers.index(self.benchmark)
+        mean = self._sum / w
+        cov = self._cross[:, b] - w * mean * mean[b]
+        var = np.diag(self._cross) - w * mean * mean
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.sqrt(var * var[b])
+        return np.clip(np.nan_to_num(corr), -1.0, 1.0)
+
+    @property
+    def last_date(self):
+        return pd.Timestamp(self._dates.values[-1])
+
+    def is_ready(self):
+        return self._rolling is not None
+
+    def update(self, timestamp, bar):
+        """
+        Applies a single bar ({ticker: close}). A bar with the same timestamp
+        as the last one replaces it (candle still forming), a later one is
+        appended. Returns False if the bar is stale or incomplete.
+        """
+        if not self.is_ready():
+            return False
+        if any(t not in bar for t in self.tickers):
+            return False
+
+        timestamp = pd.Timestamp(timestamp)
+        last_ts = self.last_date
+        if timestamp < last_ts:
+            return False
+
+        row = np.array([bar[t] for t in self.tickers], dtype=float)
+        if not np.all(np.isfinite(row)) or not np.all(row > 0):
+            return False
+        prices = self._prices.values
+
+        if timestamp == last_ts:
+            # Replace the forming candle: swap its return in the window sums
+            new_ret = np.log(row / prices[-2])
+            old_ret = self._returns.values[-1].copy()
+        else:
+            # Slide the window one bar: add the new return, drop the oldest
+            new_ret = np.log(row / prices[-1])
+            old_ret = self._returns.values[-self.window].copy()
+
+        self._sum += new_ret - old_ret
+        self._cross += np.outer(new_ret, new_ret) - np.outer(old_ret, old_ret)
+
+        if timestamp == last_ts:
+            self._prices.replace_last(row)
+            self._returns.replace_last(new_ret)
+        else:
+            self._prices.append(row)
+            self._returns.append(new_ret)
+            self._dates.append(timestamp.to_datetime64())
+
+        # Rank-one updates accumulate rounding error; resync once per window
+        self._updates += 1
+        if self._updates >= self.window:
+            self._recompute_window()
+
+        if timestamp == last_ts:
+            self._rolling.replace_last(self._benchmark_corr())
+        else:
+            self._rolling.append(self._benchmark_corr())
+        return True
+
+    def _drop(self, tickers):
+        # Removes tickers from every buffer and from the window sums, so a
+        # stale name is excluded without rebuilding the rest of the basket
+        keep = [i for i, t in enumerate(self.tickers) if t not in tickers]
+        self._prices = _RowBuffer(self._prices.values[:, keep], self._prices.capacity)
+        self._returns = _RowBuffer(self._returns.values[:, keep], self._returns.capacity)
+        self._rolling = _RowBuffer(self._rolling.values[:, keep], self._rolling.capacity)
+        self._sum = self._sum[keep]
+        self._cross = self._cross[np.ix_(keep, keep)]
+        self.excluded = sorted(set(self.excluded) | set(tickers))
+        self.tickers = [self.tickers[i] for i in keep]
+
+    def refresh(self, closes):
+        """
+        Applies recent close series ({ticker: Series}, e.g. from fetch_closes)
+        in order: the last known bar is replaced with its final price, then
+        every later bar is appended. Tickers missing from the download, or
+        with more than MAX_FILL missing bars, are dropped and reported as
+        excluded. Returns False only when the recent data does not reach back
+        to the last known bar, in which case the basket has to be rebuilt
+        from full history.
+        """
+        if not self.is_ready():
+            return False
+
+        frame = _align_frame(closes, self.interval)
+        if self.benchmark not in frame.columns:
+            return True
+        frame = frame[frame[self.benchmark].notna()].reindex(columns=self.tickers)
+        if frame.empty:
+            return True
+
+        last_ts = self.last_date
+        if frame.index[0] > last_ts:
+            return False
+        frame = frame[frame.index >= last_ts]
+        if frame.empty:
+            return True
+
+        missing = {t for t in self.tickers if frame[t].isna().all()}
+
+        # The last known bar is always complete: keep the known price where
+        # the download has none, then fill holes as _build does
+        seed = pd.Series(self._prices.values[-1], index=self.tickers)
+        if frame.index[0] > last_ts:
+            frame = pd.concat([seed.to_frame(last_ts).T, frame])
+        else:
+            frame.loc[last_ts] = frame.loc[last_ts].fillna(seed)
+        frame = frame.ffill(limit=MAX_FILL)
+
+        missing |= {t for t in self.tickers if frame[t].isna().any()}
+        missing.discard(self.benchmark)
+        if missing:
+            self._drop(missing)
+            frame = frame[self.tickers]
+
+        for timestamp, row in frame.iterrows():
+            if not self.update(timestamp, row.to_dict()):
+                break
+        return True
+
+    def analyze(self, top_pairs=10):
+        if self._prices is None or self.benchmark not in self.tickers:
+            return {"error": f"No hay datos del índice de referencia {self.benchmark}."}
+        if not self.is_ready():
+            return {"error": f"No hay suficientes datos alineados (se necesitan al menos {self.window + 1} velas comunes)."}
+
+        w = self.window
+        n = len(self.tickers)
+        b = self.tickers.index(self.benchmark)
+        prices = self._prices.values
+
+        # Covariance / correlation of the window from the running sums
+        mean = self._sum / w
+        cov = (self._cross - w * np.outer(mean, mean)) / (w - 1)
+        std = np.sqrt(np.clip(np.diag(cov), 0, None))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            corr = cov / np.outer(std, std)
+        corr = np.clip(np.nan_to_num(corr), -1.0, 1.0)
+        np.fill_diagonal(corr, 1.0)
+
+        var_b = cov[b, b]
+        beta = cov[:, b] / var_b if var_b > 0 else np.zeros(n)
+
+        # Relative strength: window performance versus the benchmark
+        perf = prices[-1] / prices[-w - 1] - 1
+        rel_strength = (1 + perf) / (1 + perf[b]) - 1
+        order = np.argsort(-rel_strength)
+
+        ranking = [
+            {
+                "rank": rank + 1,
+                "ticker": self.tickers[i],
+                "return": float(perf[i] * 100),
+                "relative_strength": float(rel_strength[i] * 100),
+                "beta": float(beta[i]),
+                "correlation": float(corr[i, b]),
+                "volatility": float(std[i] * np.sqrt(w) * 100),
+            }
+            for rank, i in enumerate(order)
+        ]
+
+        # Most correlated pairs from the upper triangle
+        iu, ju = np.triu_indices(n, k=1)
+        pair_corr = corr[iu, ju]
+        top = np.argsort(-pair_corr)[:top_pairs]
+        pairs = [
+            {"a": self.tickers[iu[k]], "b": self.tickers[ju[k]], "correlation": float(pair_corr[k])}
+            for k in top
+        ]
+
+        rolling = self._rolling.values
+        dates = pd.DatetimeIndex(self._dates.values[-len(rolling):])
+        if self.interval == "1h":
+            dates = [d.strftime('%Y-%m-%d %H:%M') for d in dates]
+        else:
+            dates = [d.strftime('%Y-%m-%d') for d in dates]
+
+        return {
+            "benchmark": self.benchmark,
+            "interval": self.interval,
+            "window": w,
+            "as_of": str(self.last_date),
+            "tickers": self.tickers,
+            "excluded": self.excluded,
+            "ranking": ranking,
+            "top_pairs": pairs,
+            "correlation_matrix": np.round(corr, 4).tolist(),
+            "rolling_correlation": {
+                "dates": dates,
+                "series": {t: np.round(rolling[:, i], 4).tolist() for i, t in enumerate(self.tickers)}
+            }
+        }
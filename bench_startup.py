@@ -0,0 +1,60 @@
+"""
+Startup benchmark: import time of app.py and latency of the first requests,
+with and without the warm-up. Each scenario runs in a fresh interpreter.
+
+    python bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+SCENARIO = r"""
+import json, sys, time
+
+t0 = time.perf_counter()
+from app import app
+import_time = time.perf_counter() - t0
+
+warmup_time = 0.0
+if sys.argv[1] == "warm":
+    from startup import warmup
+    warmup_time = warmup(app)
+
+client = app.test_client()
+timings = {"import": import_time, "warmup": warmup_time}
+for path in ("/health", "/", "/dashboard"):
+    t = time.perf_counter()
+    client.get(path)
+    timings[path] = time.perf_counter() - t
+
+# First analysis in the process, on synthetic data (no network)
+from startup import synthetic_ohlcv
+t = time.perf_counter()
+from analysis import StockAnalyzer
+analyzer = StockAnalyzer("AAPL")
+analyzer.data = synthetic_ohlcv()
+analyzer.analyze()
+timings["first analysis"] = time.perf_counter() - t
+
+print(json.dumps(timings))
+"""
+
+
+def run(mode):
+    env = dict(os.environ, REQUIRE_LOGIN="false")
+    out = subprocess.run(
+        [sys.executable, "-c", SCENARIO, mode],
+        capture_output=True, text=True, env=env, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == '__main__':
+    results = {mode: run(mode) for mode in ("cold", "warm")}
+    rows = list(results["cold"].keys())
+
+    print(f"{'':<16}{'cold (ms)':>12}{'warm (ms)':>12}")
+    for row in rows:
+        print(f"{row:<16}{results['cold'][row] * 1000:>12.1f}{results['warm'][row] * 1000:>12.1f}")
@@ -0,0 +1,105 @@
+"""
+Consistency check for the incremental basket math: a BasketAnalyzer brought
+forward with refresh()/update() must match one built from scratch on the
+extended series. Runs offline on synthetic data.
+
+    python check_basket.py
+"""
+import numpy as np
+import pandas as pd
+
+from basket import BasketAnalyzer
+from startup import synthetic_ohlcv
+
+TICKERS = ("SPY", "QQQ", "AAPL", "BTC-USD", "EURUSD=X")
+
+
+def assert_same(a, b):
+    assert a["tickers"] == b["tickers"], (a["tickers"], b["tickers"])
+    assert a["as_of"] == b["as_of"], (a["as_of"], b["as_of"])
+    assert np.allclose(a["correlation_matrix"], b["correlation_matrix"], atol=1e-6)
+    for key in ("return", "relative_strength", "beta", "correlation", "volatility"):
+        left = {r["ticker"]: r[key] for r in a["ranking"]}
+        right = {r["ticker"]: r[key] for r in b["ranking"]}
+        assert all(np.isclose(left[t], right[t], atol=1e-6) for t in left), key
+    assert a["rolling_correlation"]["dates"] == b["rolling_correlation"]["dates"]
+    for t in a["tickers"]:
+        assert np.allclose(a["rolling_correlation"]["series"][t], b["rolling_correlation"]["series"][t], atol=1e-6), t
+
+
+def check_refresh():
+    closes = {t: synthetic_ohlcv(periods=400, seed=i)["Close"] for i, t in enumerate(TICKERS)}
+
+    # Basket built while bar 299 was still forming (partial price)
+    start = {t: s.iloc[:300].copy() for t, s in closes.items()}
+    for s in start.values():
+        s.iloc[-1] *= 1.03
+    basket = BasketAnalyzer(start)
+
+    # Missed polls: the recent download covers the forming bar and 40 more
+    assert basket.refresh({t: s.iloc[295:340] for t, s in closes.items()})
+    assert_same(basket.analyze(), BasketAnalyzer({t: s.iloc[:340] for t, s in closes.items()}).analyze())
+
+    # Enough single-bar updates to go through buffer compaction and resyncs
+    for i in range(340, 400):
+        assert basket.update(closes["SPY"].index[i].tz_localize(None).normalize(),
+                             {t: float(s.iloc[i]) for t, s in closes.items()})
+    assert_same(basket.analyze(), BasketAnalyzer(closes).analyze())
+
+
+def check_gap():
+    closes = {t: synthetic_ohlcv(periods=300, seed=i)["Close"] for i, t in enumerate(TICKERS)}
+    basket = BasketAnalyzer({t: s.iloc[:200] for t, s in closes.items()})
+    assert not basket.refresh({t: s.iloc[250:] for t, s in closes.items()})
+
+
+def check_incomplete_refresh():
+    closes = {t: synthetic_ohlcv(periods=400, seed=i)["Close"] for i, t in enumerate(TICKERS)}
+    start = {t: s.iloc[:300] for t, s in closes.items()}
+
+    # No bar for AAPL at the last known timestamp: the known price is kept
+    basket = BasketAnalyzer(start)
+    recent = {t: s.iloc[299:320].copy() for t, s in closes.items()}
+    recent["AAPL"].iloc[0] = np.nan
+    assert basket.refresh(recent)
+    assert_same(basket.analyze(), BasketAnalyzer({t: s.iloc[:320] for t, s in closes.items()}).analyze())
+
+    # Download lagging behind the last known bar: nothing to apply
+    basket = BasketAnalyzer(start)
+    assert basket.refresh({t: s.iloc[290:298] for t, s in closes.items()})
+    assert basket.analyze()["as_of"] == BasketAnalyzer(start).analyze()["as_of"]
+
+    # Missing or stale tickers are dropped, the rest match a basket without them
+    basket = BasketAnalyzer(start)
+    recent = {t: s.iloc[295:320].copy() for t, s in closes.items() if t != "QQQ"}
+    recent["AAPL"].iloc[-5:] = np.nan
+    assert basket.refresh(recent)
+    res = basket.analyze()
+    assert res["excluded"] == ["AAPL", "QQQ"], res["excluded"]
+    assert_same(res, BasketAnalyzer({t: closes[t].iloc[:320] for t in res["tickers"]}).analyze())
+
+    # Non-finite closes never reach the window sums
+    bar = {t: float(s.iloc[320]) for t, s in closes.items() if t in res["tickers"]}
+    bar["BTC-USD"] = np.nan
+    assert not basket.update(closes["SPY"].index[320].tz_localize(None).normalize(), bar)
+
+
+def check_alignment():
+    # Hourly stock bars print on :30, crypto on :00; a short ticker is dropped
+    index = pd.date_range("2024-01-02 14:30", periods=300, freq="h", tz="UTC")
+    spy = synthetic_ohlcv(periods=300, seed=0)["Close"].set_axis(index)
+    btc = synthetic_ohlcv(periods=300, seed=1)["Close"].set_axis(index - pd.Timedelta("30min"))
+    new = synthetic_ohlcv(periods=300, seed=2)["Close"].set_axis(index).iloc[-20:]
+
+    res = BasketAnalyzer({"SPY": spy, "BTC-USD": btc, "NEW": new}, interval="1h").analyze()
+    assert "error" not in res, res
+    assert res["tickers"] == ["SPY", "BTC-USD"], res["tickers"]
+    assert res["excluded"] == ["NEW"], res["excluded"]
+
+
+if __name__ == '__main__':
+    check_refresh()
+    check_gap()
+    check_incomplete_refresh()
+    check_alignment()
+    print("Basket checks passed")
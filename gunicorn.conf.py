@@ -0,0 +1,42 @@
+import gc
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '3000')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+timeout = 120
+accesslog = "-"
+errorlog = "-"
+
+# Load the app once in the master and fork workers from it, so imported
+# modules and static data are shared copy-on-write instead of re-imported
+# on every worker (re)start.
+preload_app = os.getenv("PRELOAD_APP", "true").lower() == "true"
+
+
+def when_ready(server):
+    # Runs in the master before any worker is spawned
+    if not preload_app:
+        return
+    from startup import warmup, warmup_enabled
+    if warmup_enabled():
+        # The warm-up is optional: a failure must not stop the server
+        try:
+            from app import app
+            warmup(app)
+        except Exception:
+            server.log.exception("Warm-up failed, starting without it")
+    # Move everything allocated so far out of the GC's reach; otherwise the
+    # first collection in each worker touches (and copies) the shared pages.
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Without preload each worker warms itself up before accepting traffic
+    if preload_app:
+        return
+    from startup import warmup, warmup_enabled
+    if warmup_enabled():
+        try:
+            warmup(worker.app.wsgi())
+        except Exception:
+            worker.log.exception("Warm-up failed, serving without it")
@@ -0,0 +1,59 @@
+import os
+import time
+
+
+def warmup_enabled():
+    return os.getenv("WARMUP", "true").lower() == "true"
+
+
+def synthetic_ohlcv(periods=260, seed=0):
+    """
+    Builds a deterministic OHLCV frame shaped like yfinance history, so the
+    analysis code paths can be exercised without touching the network.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    index = pd.date_range(end="2024-12-31", periods=periods, freq="B", tz="America/New_York")
+    return pd.DataFrame({
+        "Open": close * (1 + rng.normal(0, 0.002, periods)),
+        "High": close * 1.01,
+        "Low": close * 0.99,
+        "Close": close,
+        "Volume": rng.integers(1_000_000, 5_000_000, periods).astype(float)
+    }, index=index)
+
+
+def warmup(app):
+    """
+    Imports the heavy modules, runs one synthetic analysis (single ticker and
+    basket) and compiles every template. Run in the gunicorn master with
+    preload_app so the result is shared copy-on-write by all workers.
+    Returns the elapsed seconds.
+    """
+    start = time.perf_counter()
+
+    from analysis import StockAnalyzer
+    from basket import BasketAnalyzer
+
+    closes = {}
+    for i, ticker in enumerate(("SPY", "QQQ", "AAPL")):
+        analyzer = StockAnalyzer(ticker)
+        analyzer.data = synthetic_ohlcv(seed=i)
+        analyzer.analyze()
+        closes[ticker] = analyzer.data["Close"]
+
+    basket = BasketAnalyzer(closes, benchmark="SPY")
+    basket.analyze()
+    last = {t: float(s.iloc[-1]) for t, s in closes.items()}
+    basket.update(basket.last_date, last)
+
+    for name in app.jinja_env.list_templates():
+        if name.endswith(".html"):
+            app.jinja_env.get_template(name)
+
+    elapsed = time.perf_counter() - start
+    print(f"Warm-up completed in {elapsed:.2f}s")
+    return elapsed